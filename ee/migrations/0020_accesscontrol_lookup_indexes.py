@@ -0,0 +1,26 @@
+# Generated by Django 4.2.15 on 2025-01-06 10:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # Added to support concurrent index creation
+    dependencies = [
+        ("ee", "0019_remove_conversationcheckpointblob_unique_checkpoint_blob_and_more"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="accesscontrol",
+            index=models.Index(fields=["team", "resource", "resource_id"], name="ac_team_res_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="accesscontrol",
+            index=models.Index(fields=["team", "organization_member"], name="ac_team_member_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="accesscontrol",
+            index=models.Index(fields=["team", "role"], name="ac_team_role_idx"),
+        ),
+    ]
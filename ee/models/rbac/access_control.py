@@ -11,6 +11,13 @@ class AccessControl(UUIDModel):
                 name="unique resource per target",
             )
         ]
+        # Permission checks filter on (team, resource, resource_id) and then narrow by member or role,
+        # which the wide unique constraint above can't serve efficiently
+        indexes = [
+            models.Index(fields=["team", "resource", "resource_id"], name="ac_team_res_idx"),
+            models.Index(fields=["team", "organization_member"], name="ac_team_member_idx"),
+            models.Index(fields=["team", "role"], name="ac_team_role_idx"),
+        ]
 
     team = models.ForeignKey(
         "posthog.Team",
@@ -21,7 +21,8 @@ class DatabaseField(FieldOrTable):
     Base class for a field in a database table.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    # Frozen, as field instances are shared between table definitions (e.g. cached warehouse tables)
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     name: str
     array: Optional[bool] = None
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.15 on 2025-01-06 10:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # Added to support concurrent index creation
+    dependencies = [
+        ("posthog", "0536_alertconfiguration_skip_weekend"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="insight",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["team", "short_id"],
+                name="insight_live_idx",
+            ),
+        ),
+    ]
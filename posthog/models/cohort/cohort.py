@@ -272,6 +272,9 @@ class Cohort(models.Model):
             # Make sure persons are created in tests before running this
             flush_persons_and_events()
 
+        # Uploaded lists often repeat ids, don't spend batch slots on duplicates
+        items = list(dict.fromkeys(items))
+
         try:
             cursor = connection.cursor()
             for i in range(0, len(items), batchsize):
@@ -287,7 +290,8 @@ class Cohort(models.Model):
                     .exclude(cohort__id=self.id)
                 )
                 insert_static_cohort(
-                    list(persons_query.values_list("uuid", flat=True)),
+                    # A person matched by several distinct IDs in the batch is only inserted once
+                    list(persons_query.values_list("uuid", flat=True).distinct()),
                     self.pk,
                     team_id=team_id,
                 )
@@ -332,6 +336,8 @@ class Cohort(models.Model):
         """
         from posthog.models.cohort.util import get_static_cohort_size, insert_static_cohort
 
+        items = list(dict.fromkeys(items))
+
         try:
             cursor = connection.cursor()
             for i in range(0, len(items), batchsize):
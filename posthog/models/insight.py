@@ -1,4 +1,6 @@
-from functools import cached_property
+import copy
+import json
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from sentry_sdk import capture_exception
@@ -18,6 +20,13 @@ from posthog.utils import absolute_uri, generate_cache_key, generate_short_id
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _filter_to_query_cached(filters_json: str) -> dict:
+    from posthog.hogql_queries.legacy_compatibility.filter_to_query import filter_to_query
+
+    return filter_to_query(json.loads(filters_json)).model_dump(exclude_none=True)
+
+
 class InsightManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().exclude(deleted=True)
@@ -101,17 +110,25 @@ class Insight(models.Model):
     class Meta:
         db_table = "posthog_dashboarditem"
         unique_together = ("team", "short_id")
+        indexes = [
+            # InsightManager always excludes soft-deleted insights
+            models.Index(
+                name="insight_live_idx",
+                fields=["team", "short_id"],
+                condition=models.Q(deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return self.name or self.derived_name or self.short_id
 
-    @property
+    @cached_property
     def is_sharing_enabled(self):
         # uses .all and not .first so that prefetching can be used
         sharing_configurations = self.sharingconfiguration_set.all()
         return sharing_configurations[0].enabled if sharing_configurations and sharing_configurations[0] else False
 
-    @property
+    @cached_property
     def caching_state(self):
         # uses .all and not .first so that prefetching can be used
         for state in self.caching_states.all():
@@ -121,12 +138,13 @@ class Insight(models.Model):
 
     @cached_property
     def query_from_filters(self):
-        from posthog.hogql_queries.legacy_compatibility.filter_to_query import filter_to_query
-
         try:
+            # Converting is pure in the filters, so share the work between insights with identical filters
+            filters_json = json.dumps(self.filters, sort_keys=True, default=str)
             return {
                 "kind": "InsightVizNode",
-                "source": filter_to_query(self.filters).model_dump(exclude_none=True),
+                # Copy so that callers can't modify the cached source
+                "source": copy.deepcopy(_filter_to_query_cached(filters_json)),
                 "full": True,
             }
         except Exception as e:
@@ -147,19 +165,16 @@ class Insight(models.Model):
                 )
             }
             dashboard_properties = dashboard_filters.pop("properties") if dashboard_filters.get("properties") else None
-            insight_date_from = self.filters.get("date_from", None)
-            insight_date_to = self.filters.get("date_to", None)
+            insight_properties = self.filters.get("properties")
             dashboard_date_from = dashboard_filters.get("date_from", None)
             dashboard_date_to = dashboard_filters.get("date_to", None)
 
-            filters = {
-                **self.filters,
-                **dashboard_filters,
-            }
+            filters = self.filters.copy()
+            filters.update(dashboard_filters)
 
             if dashboard_date_from is None:
-                filters["date_from"] = insight_date_from
-                filters["date_to"] = insight_date_to
+                filters["date_from"] = self.filters.get("date_from", None)
+                filters["date_to"] = self.filters.get("date_to", None)
             else:
                 filters["date_from"] = dashboard_date_from
                 filters["date_to"] = dashboard_date_to
@@ -168,28 +183,28 @@ class Insight(models.Model):
                 filters["compare"] = None
 
             if dashboard_properties:
-                if isinstance(self.filters.get("properties"), list):
+                if isinstance(insight_properties, list):
                     filters["properties"] = {
                         "type": "AND",
                         "values": [
-                            {"type": "AND", "values": self.filters["properties"]},
+                            {"type": "AND", "values": insight_properties},
                             {"type": "AND", "values": dashboard_properties},
                         ],
                     }
-                elif not self.filters.get("properties"):
+                elif not insight_properties:
                     filters["properties"] = dashboard_properties
-                elif self.filters.get("properties").get("type"):
+                elif insight_properties.get("type"):
                     filters["properties"] = {
                         "type": "AND",
                         "values": [
-                            self.filters["properties"],
+                            insight_properties,
                             {"type": "AND", "values": dashboard_properties},
                         ],
                     }
                 else:
-                    raise ValidationError("Unrecognized property format: ", self.filters["properties"])
-            elif self.filters.get("properties"):
-                filters["properties"] = self.filters.get("properties")
+                    raise ValidationError("Unrecognized property format: ", insight_properties)
+            elif insight_properties:
+                filters["properties"] = insight_properties
 
             return filters
         else:
@@ -108,6 +108,17 @@ class TestInsightModel(BaseTest):
 
         assert filters_hash_one != filters_hash_two
 
+    def test_stickiness_filters_hash_without_dashboard(self) -> None:
+        for filters in [
+            {"insight": "STICKINESS", "events": [{"id": "$pageview"}], "date_from": "-7d"},
+            {"insight": "TRENDS", "shown_as": "Stickiness", "events": [{"id": "$pageview"}], "date_from": "-7d"},
+        ]:
+            insight = Insight.objects.create(team=self.team, filters=filters)
+
+            filters_hash = generate_insight_filters_hash(insight, None)
+
+            assert isinstance(filters_hash, str) and filters_hash
+
     def test_dashboard_with_query_insight_and_filters(self) -> None:
         browser_equals_firefox = {
             "key": "$browser",
@@ -224,3 +235,16 @@ class TestInsightModel(BaseTest):
             assert data
             actual = data["source"]["filters"]
             assert expected_filters == actual
+
+    def test_query_from_filters_is_shared_between_identical_filters(self) -> None:
+        filters = {"insight": "TRENDS", "events": [{"id": "$pageview"}], "date_from": "-7d"}
+        insight = Insight.objects.create(team=self.team, filters=filters)
+        other_insight = Insight.objects.create(team=self.team, filters=dict(reversed(filters.items())))
+
+        query = insight.query_from_filters
+        assert query is not None
+        assert query["source"]["kind"] == "TrendsQuery"
+
+        query["source"]["dateRange"] = {"date_from": "-30d"}
+        assert other_insight.query_from_filters is not None
+        assert other_insight.query_from_filters["source"]["dateRange"] == {"date_from": "-7d"}
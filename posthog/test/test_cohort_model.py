@@ -1,8 +1,11 @@
+from unittest.mock import patch
+
 import pytest
 
 from posthog.client import sync_execute
 from posthog.models import Cohort, Person, Team
 from posthog.models.cohort.sql import GET_COHORTPEOPLE_BY_COHORT_ID
+from posthog.models.cohort.util import insert_static_cohort
 from posthog.test.base import BaseTest
 
 
@@ -33,6 +36,33 @@ class TestCohort(BaseTest):
         self.assertEqual(cohort.people.count(), 2)
         self.assertEqual(cohort.is_calculating, False)
 
+    def test_insert_by_list_with_duplicate_ids(self):
+        person = Person.objects.create(team=self.team, distinct_ids=["123", "456"])
+
+        cohort = Cohort.objects.create(team=self.team, groups=[], is_static=True)
+        with patch("posthog.models.cohort.util.insert_static_cohort", wraps=insert_static_cohort) as mock_insert:
+            cohort.insert_users_by_list(["123", "456", "123", "456"])
+
+        # The person matches through both distinct IDs, but is only written to ClickHouse once
+        mock_insert.assert_called_once()
+        assert mock_insert.call_args.args[0] == [person.uuid]
+        cohort = Cohort.objects.get()
+        self.assertEqual(cohort.people.count(), 1)
+
+    def test_insert_by_uuid_list_with_duplicate_uuids(self):
+        person = Person.objects.create(team=self.team, distinct_ids=["123"])
+
+        cohort = Cohort.objects.create(team=self.team, groups=[], is_static=True)
+        with patch("posthog.models.cohort.util.insert_static_cohort", wraps=insert_static_cohort) as mock_insert:
+            cohort.insert_users_list_by_uuid(
+                [str(person.uuid)] * 3, insert_in_clickhouse=True, batchsize=1, team_id=self.team.pk
+            )
+
+        # Repeated uuids don't take up batches of their own
+        mock_insert.assert_called_once()
+        cohort = Cohort.objects.get()
+        self.assertEqual(cohort.people.count(), 1)
+
     @pytest.mark.ee
     def test_calculating_cohort_clickhouse(self):
         cohort = Cohort.objects.create(
@@ -13,7 +13,6 @@ from posthog.warehouse.models import (
     asave_saved_query,
 )
 
-from asgiref.sync import sync_to_async
 from posthog.temporal.common.logger import bind_temporal_worker_logger
 from clickhouse_driver.errors import ServerException
 
@@ -62,7 +61,7 @@ async def create_table_from_saved_query(
         assert isinstance(table_created, DataWarehouseTable) and table_created is not None
 
         # TODO: handle dlt columns schemas. Need to refactor dag pipeline to pass through schema or propagate from upstream tables
-        table_created.columns = await sync_to_async(table_created.get_columns)()
+        table_created.columns = await table_created.aget_columns()
         await asave_datawarehousetable(table_created)
 
         saved_query = await aget_saved_query_by_id(saved_query_id=saved_query_id_converted, team_id=team_id)
@@ -27,7 +27,6 @@ from posthog.warehouse.models import (
 from posthog.warehouse.models.external_data_job import ExternalDataJob
 from posthog.temporal.common.logger import bind_temporal_worker_logger
 from clickhouse_driver.errors import ServerException
-from asgiref.sync import sync_to_async
 from posthog.warehouse.models.external_data_schema import ExternalDataSchema
 from dlt.common.normalizers.naming.snake_case import NamingConvention
 
@@ -138,7 +137,7 @@ async def validate_schema_and_update_table(
             table_created.format = table_params.get("format")
             table_created.url_pattern = new_url_pattern
             if incremental:
-                table_created.row_count = await sync_to_async(table_created.get_count)()
+                table_created.row_count = await table_created.aget_count()
             else:
                 table_created.row_count = row_count
             await asave_datawarehousetable(table_created)
@@ -150,13 +149,13 @@ async def validate_schema_and_update_table(
 
         # Temp fix #2 for Delta tables without table_format
         try:
-            await sync_to_async(table_created.get_columns)()
+            await table_created.aget_columns()
         except Exception as e:
             if table_format == DataWarehouseTable.TableFormat.DeltaS3Wrapper:
                 logger.exception("get_columns exception with DeltaS3Wrapper format - trying Delta format", exc_info=e)
 
                 table_created.format = DataWarehouseTable.TableFormat.Delta
-                await sync_to_async(table_created.get_columns)()
+                await table_created.aget_columns()
                 await asave_datawarehousetable(table_created)
 
                 logger.info("Delta format worked - updating table to use Delta")
@@ -166,7 +165,7 @@ async def validate_schema_and_update_table(
         for schema in table_schema.values():
             if schema.get("resource") == _schema_name:
                 schema_columns = schema.get("columns") or {}
-                raw_db_columns: dict[str, dict[str, str]] = await sync_to_async(table_created.get_columns)()
+                raw_db_columns: dict[str, dict[str, str]] = await table_created.aget_columns()
                 db_columns = {key: column.get("clickhouse", "") for key, column in raw_db_columns.items()}
 
                 columns = {}
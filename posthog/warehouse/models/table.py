@@ -1,6 +1,11 @@
+import asyncio
+import re
+from collections.abc import Mapping
 from datetime import datetime
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Optional, TypeAlias
 from django.db import models
+from django.utils import timezone
 
 from posthog.client import sync_execute
 from posthog.errors import wrap_query_error
@@ -32,16 +37,18 @@ from posthog.hogql.context import HogQLContext
 if TYPE_CHECKING:
     from posthog.warehouse.models import ExternalDataJob
 
-SERIALIZED_FIELD_TO_CLICKHOUSE_MAPPING: dict[DatabaseSerializedFieldType, str] = {
-    DatabaseSerializedFieldType.INTEGER: "Int64",
-    DatabaseSerializedFieldType.FLOAT: "Float64",
-    DatabaseSerializedFieldType.STRING: "String",
-    DatabaseSerializedFieldType.DATETIME: "DateTime64",
-    DatabaseSerializedFieldType.DATE: "Date",
-    DatabaseSerializedFieldType.BOOLEAN: "Bool",
-    DatabaseSerializedFieldType.ARRAY: "Array",
-    DatabaseSerializedFieldType.JSON: "Map",
-}
+SERIALIZED_FIELD_TO_CLICKHOUSE_MAPPING: Mapping[DatabaseSerializedFieldType, str] = MappingProxyType(
+    {
+        DatabaseSerializedFieldType.INTEGER: "Int64",
+        DatabaseSerializedFieldType.FLOAT: "Float64",
+        DatabaseSerializedFieldType.STRING: "String",
+        DatabaseSerializedFieldType.DATETIME: "DateTime64",
+        DatabaseSerializedFieldType.DATE: "Date",
+        DatabaseSerializedFieldType.BOOLEAN: "Bool",
+        DatabaseSerializedFieldType.ARRAY: "Array",
+        DatabaseSerializedFieldType.JSON: "Map",
+    }
+)
 
 ExtractErrors = {
     "The AWS Access Key Id you provided does not exist": "The Access Key you provided does not exist",
@@ -58,6 +65,17 @@ ExtractErrors = {
     "Rows have different amount of values": "The provided file has rows with different amount of values",
 }
 
+# Match all known errors in one pass, the matched group's index points into the exposed messages
+_EXTRACT_ERRORS_PATTERN = re.compile("|".join(f"(?P<e{i}>{re.escape(key)})" for i, key in enumerate(ExtractErrors)))
+_EXTRACT_ERRORS_MESSAGES = list(ExtractErrors.values())
+
+
+def _strip_nullable(clickhouse_type: str) -> tuple[str, bool]:
+    if clickhouse_type.startswith("Nullable("):
+        return clickhouse_type[len("Nullable(") : -1], True
+    return clickhouse_type, False
+
+
 DataWarehouseTableColumns: TypeAlias = dict[str, dict[str, str | bool]] | dict[str, str]
 
 
@@ -70,6 +88,29 @@ class DataWarehouseTableManager(models.Manager):
             .prefetch_related("externaldataschema_set")
         )
 
+    def with_hogql_ready(self):
+        # Only loads what's needed to query the table from ClickHouse, with the credential and source
+        # joined in so that building the S3 table function doesn't lazily fetch them one by one
+        return (
+            super()
+            .get_queryset()
+            .select_related("credential", "external_data_source")
+            .only(
+                "id",
+                "team",
+                "name",
+                "url_pattern",
+                "format",
+                "columns",
+                "row_count",
+                # Must be loaded for auto_now to be written when a table fetched this way is saved
+                "updated_at",
+                "credential__access_key",
+                "credential__access_secret",
+                "external_data_source__prefix",
+            )
+        )
+
 
 class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, DeletedMetaFields):
     # loading external_data_source and credentials is easily N+1,
@@ -117,9 +158,13 @@ class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, Delete
         self.deleted_at = datetime.now()
         self.save()
 
+    @property
     def table_name_without_prefix(self) -> str:
-        if self.external_data_source is not None and self.external_data_source.prefix is not None:
-            prefix = self.external_data_source.prefix
+        # Not cached, as `name` and `external_data_source` can change on the instance. Django keeps the loaded
+        # source in its related object cache, so the source is fetched at most once either way.
+        external_data_source = self.external_data_source
+        if external_data_source is not None and external_data_source.prefix is not None:
+            prefix = external_data_source.prefix
         else:
             prefix = ""
         return self.name[len(prefix) :]
@@ -147,7 +192,7 @@ class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, Delete
         safe_expose_ch_error: bool = True,
     ) -> DataWarehouseTableColumns:
         try:
-            placeholder_context = HogQLContext(team_id=self.team.pk)
+            placeholder_context = HogQLContext(team_id=self.team_id)
             s3_table_func = build_function_call(
                 url=self.url_pattern,
                 format=self.format,
@@ -186,9 +231,20 @@ class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, Delete
 
         return columns
 
+    async def aget_columns(
+        self,
+        pipeline_version: Optional["ExternalDataJob.PipelineVersion"] = None,
+        safe_expose_ch_error: bool = True,
+    ) -> DataWarehouseTableColumns:
+        # The DESCRIBE runs against S3 and can take a while, so keep it off the event loop
+        await self._aload_credential()
+        return await asyncio.to_thread(
+            self.get_columns, pipeline_version=pipeline_version, safe_expose_ch_error=safe_expose_ch_error
+        )
+
     def get_count(self, safe_expose_ch_error=True) -> int:
         try:
-            placeholder_context = HogQLContext(team_id=self.team.pk)
+            placeholder_context = HogQLContext(team_id=self.team_id)
             s3_table_func = build_function_call(
                 url=self.url_pattern,
                 format=self.format,
@@ -210,50 +266,48 @@ class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, Delete
 
         return result[0][0]
 
+    async def aget_count(self, safe_expose_ch_error=True) -> int:
+        await self._aload_credential()
+        return await asyncio.to_thread(self.get_count, safe_expose_ch_error=safe_expose_ch_error)
+
+    async def _aload_credential(self) -> None:
+        # Load the credential on Django's managed sync thread before offloading, otherwise the lazy fetch
+        # happens on an executor thread and opens a database connection that Django never closes
+        await database_sync_to_async(lambda: self.credential)()
+
     def hogql_definition(self, modifiers: Optional[HogQLQueryModifiers] = None) -> S3Table:
+        use_invalid_columns = modifiers is not None and bool(modifiers.s3TableUseInvalidColumns)
         columns = self.columns or {}
 
+        # Tables with a curated definition expose exactly those fields, so the fields built from the
+        # columns would be thrown away - only the structure is needed for them
+        external_table_fields = external_tables.get(self.table_name_without_prefix)
+        build_fields = external_table_fields is None
+
         fields: dict[str, FieldOrTable] = {}
-        structure = []
+        structure: list[str] = []
         for column, type in columns.items():
             # Support for 'old' style columns
-            if isinstance(type, str):
-                clickhouse_type = type
-            else:
-                clickhouse_type = type["clickhouse"]
-
-            is_nullable = False
-
-            if clickhouse_type.startswith("Nullable("):
-                clickhouse_type = clickhouse_type.replace("Nullable(", "")[:-1]
-                is_nullable = True
+            is_old_style = isinstance(type, str)
+            clickhouse_type, is_nullable = _strip_nullable(type if is_old_style else type["clickhouse"])
 
             # TODO: remove when addressed https://github.com/ClickHouse/ClickHouse/issues/37594
             if clickhouse_type.startswith("Array("):
                 clickhouse_type = remove_named_tuples(clickhouse_type)
 
-            if isinstance(type, dict):
-                column_invalid = not type.get("valid", True)
-            else:
-                column_invalid = False
+            column_invalid = not is_old_style and not type.get("valid", True)
+            if not column_invalid or use_invalid_columns:
+                structure.append(
+                    f"`{column}` Nullable({clickhouse_type})" if is_nullable else f"`{column}` {clickhouse_type}"
+                )
 
-            if not column_invalid or (modifiers is not None and modifiers.s3TableUseInvalidColumns):
-                if is_nullable:
-                    structure.append(f"`{column}` Nullable({clickhouse_type})")
+            if build_fields:
+                if is_old_style:
+                    hogql_type = CLICKHOUSE_HOGQL_MAPPING[clickhouse_type.partition("(")[0]]
                 else:
-                    structure.append(f"`{column}` {clickhouse_type}")
-
-            # Support for 'old' style columns
-            if isinstance(type, str):
-                hogql_type_str = clickhouse_type.partition("(")[0]
-                hogql_type = CLICKHOUSE_HOGQL_MAPPING[hogql_type_str]
-            else:
-                hogql_type = STR_TO_HOGQL_MAPPING[type["hogql"]]
-
-            fields[column] = hogql_type(name=column, nullable=is_nullable)
+                    hogql_type = STR_TO_HOGQL_MAPPING[type["hogql"]]
+                fields[column] = hogql_type(name=column, nullable=is_nullable)
 
-        # Replace fields with any redefined fields if they exist
-        external_table_fields = external_tables.get(self.table_name_without_prefix())
         default_fields = external_tables.get("*", {})
         if external_table_fields is not None:
             fields = {**external_table_fields, **default_fields}
@@ -275,34 +329,40 @@ class DataWarehouseTable(CreatedMetaFields, UpdatedMetaFields, UUIDModel, Delete
         )
 
     def get_clickhouse_column_type(self, column_name: str) -> Optional[str]:
-        clickhouse_type = self.columns.get(column_name, None)
+        clickhouse_type = (self.columns or {}).get(column_name, None)
 
-        if isinstance(clickhouse_type, dict) and self.columns[column_name].get("clickhouse"):
-            clickhouse_type = self.columns[column_name].get("clickhouse")
+        # New style columns keep the type under `clickhouse`, old style ones are the type itself
+        if isinstance(clickhouse_type, dict):
+            clickhouse_type = clickhouse_type.get("clickhouse")
 
-            if clickhouse_type.startswith("Nullable("):
-                clickhouse_type = clickhouse_type.replace("Nullable(", "")[:-1]
+        if not clickhouse_type:
+            return None
 
-        return clickhouse_type
+        return _strip_nullable(clickhouse_type)[0]
 
     def _safe_expose_ch_error(self, err):
         err = wrap_query_error(err)
-        for key, value in ExtractErrors.items():
-            if key in err.message:
-                raise Exception(value)
+        match = _EXTRACT_ERRORS_PATTERN.search(err.message)
+        if match is not None and match.lastgroup is not None:
+            raise Exception(_EXTRACT_ERRORS_MESSAGES[int(match.lastgroup[1:])])
         raise Exception("Could not get columns")
 
 
 @database_sync_to_async
 def get_table_by_url_pattern_and_source(url_pattern: str, source_id: UUID, team_id: int) -> DataWarehouseTable:
-    return DataWarehouseTable.objects.filter(Q(deleted=False) | Q(deleted__isnull=True)).get(
-        team_id=team_id, external_data_source_id=source_id, url_pattern=url_pattern
+    return (
+        DataWarehouseTable.objects.with_hogql_ready()
+        .filter(Q(deleted=False) | Q(deleted__isnull=True))
+        .get(team_id=team_id, external_data_source_id=source_id, url_pattern=url_pattern)
     )
 
 
 @database_sync_to_async
 def get_table_by_schema_id(schema_id: str, team_id: int):
-    return ExternalDataSchema.objects.get(id=schema_id, team_id=team_id).table
+    table_id = ExternalDataSchema.objects.values_list("table_id", flat=True).get(id=schema_id, team_id=team_id)
+    if table_id is None:
+        return None
+    return DataWarehouseTable.objects.with_hogql_ready().get(id=table_id)
 
 
 @database_sync_to_async
@@ -313,3 +373,18 @@ def acreate_datawarehousetable(**kwargs):
 @database_sync_to_async
 def asave_datawarehousetable(table: DataWarehouseTable) -> None:
     table.save()
+
+
+@database_sync_to_async
+def abulk_create_datawarehousetables(rows: list[dict]) -> list[DataWarehouseTable]:
+    return DataWarehouseTable.objects.bulk_create([DataWarehouseTable(**row) for row in rows], batch_size=500)
+
+
+@database_sync_to_async
+def abulk_save_datawarehousetables(tables: list[DataWarehouseTable], fields: list[str]) -> None:
+    # bulk_update doesn't run pre_save, so `auto_now` has to be applied by hand
+    now = timezone.now()
+    for table in tables:
+        table.updated_at = now
+
+    DataWarehouseTable.objects.bulk_update(tables, fields=list({*fields, "updated_at"}), batch_size=500)
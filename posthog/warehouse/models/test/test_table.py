@@ -1,8 +1,14 @@
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
+from clickhouse_driver.errors import ServerException
+from freezegun import freeze_time
+
 from posthog.hogql.database.models import DateTimeDatabaseField, IntegerDatabaseField, StringDatabaseField
 from posthog.test.base import BaseTest
 from posthog.warehouse.models import DataWarehouseCredential, DataWarehouseTable
+from posthog.warehouse.models.external_table_definitions import external_tables
+from posthog.warehouse.models.table import abulk_create_datawarehousetables, abulk_save_datawarehousetables
 
 
 class TestTable(BaseTest):
@@ -120,6 +126,38 @@ class TestTable(BaseTest):
                 }
             }
 
+    def test_async_get_columns_and_count(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        DataWarehouseTable.objects.create(
+            name="test_table", url_pattern="", credential=credential, format="Parquet", team=self.team
+        )
+        # Loaded without the credential, so the async wrappers have to fetch it themselves
+        table = DataWarehouseTable.objects.get(name="test_table")
+
+        with patch("posthog.warehouse.models.table.sync_execute") as sync_execute_results:
+            sync_execute_results.return_value = [["id", "Int64"]]
+            assert async_to_sync(table.aget_columns)() == table.get_columns()
+
+            sync_execute_results.return_value = [[42]]
+            assert async_to_sync(table.aget_count)() == table.get_count() == 42
+
+    def test_get_columns_exposes_known_clickhouse_errors(self):
+        credential = DataWarehouseCredential.objects.create(access_key="key", access_secret="secret", team=self.team)
+        table = DataWarehouseTable.objects.create(
+            name="test_table", url_pattern="", credential=credential, format="Parquet", team=self.team
+        )
+
+        with patch("posthog.warehouse.models.table.sync_execute") as sync_execute_results:
+            sync_execute_results.side_effect = ServerException(
+                "S3 exception: `NoSuchBucket`, message: 'The specified bucket does not exist.'", code=499
+            )
+            with self.assertRaisesMessage(Exception, "The provided bucket doesn't exist"):
+                table.get_columns()
+
+            sync_execute_results.side_effect = ServerException("Something unexpected", code=499)
+            with self.assertRaisesMessage(Exception, "Could not get columns"):
+                table.get_columns()
+
     def test_hogql_definition_old_style(self):
         credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
         table = DataWarehouseTable.objects.create(
@@ -253,3 +291,106 @@ class TestTable(BaseTest):
             table.hogql_definition().structure,
             "`id` String, `mrr` Nullable(Int64)",
         )
+
+    def test_hogql_definition_with_external_table_definition(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+        table = DataWarehouseTable.objects.create(
+            name="stripe_account",
+            url_pattern="https://databeach-hackathon.s3.amazonaws.com/tim_test/test_events6.pqt",
+            format=DataWarehouseTable.TableFormat.Parquet,
+            team=self.team,
+            columns={
+                "id": {"clickhouse": "String", "hogql": "StringDatabaseField"},
+                "not_in_definition": {"clickhouse": "Nullable(Int64)", "hogql": "IntegerDatabaseField"},
+            },
+            credential=credential,
+        )
+
+        hogql_definition = table.hogql_definition()
+
+        assert hogql_definition.fields == {**external_tables["stripe_account"], **external_tables["*"]}
+        assert hogql_definition.structure == "`id` String, `not_in_definition` Nullable(Int64)"
+
+    def test_get_clickhouse_column_type(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+        table = DataWarehouseTable.objects.create(
+            name="bla",
+            url_pattern="https://databeach-hackathon.s3.amazonaws.com/tim_test/test_events6.pqt",
+            format=DataWarehouseTable.TableFormat.Parquet,
+            team=self.team,
+            columns={
+                "id": "String",
+                "timestamp": {"clickhouse": "Nullable(DateTime64(3, 'UTC'))", "hogql": "DateTimeDatabaseField"},
+            },
+            credential=credential,
+        )
+
+        assert table.get_clickhouse_column_type("id") == "String"
+        assert table.get_clickhouse_column_type("timestamp") == "DateTime64(3, 'UTC')"
+        assert table.get_clickhouse_column_type("missing") is None
+
+    def test_get_clickhouse_column_type_old_style_nullable(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+        table = DataWarehouseTable.objects.create(
+            name="bla",
+            url_pattern="https://databeach-hackathon.s3.amazonaws.com/tim_test/test_events6.pqt",
+            format=DataWarehouseTable.TableFormat.Parquet,
+            team=self.team,
+            columns={"timestamp": "Nullable(DateTime64(3, 'UTC'))"},
+            credential=credential,
+        )
+
+        assert table.get_clickhouse_column_type("timestamp") == "DateTime64(3, 'UTC')"
+
+    def test_hogql_definition_after_rename(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+        table = DataWarehouseTable.objects.create(
+            name="bla",
+            url_pattern="https://databeach-hackathon.s3.amazonaws.com/tim_test/test_events6.pqt",
+            format=DataWarehouseTable.TableFormat.Parquet,
+            team=self.team,
+            columns={"not_in_definition": {"clickhouse": "String", "hogql": "StringDatabaseField"}},
+            credential=credential,
+        )
+        assert list(table.hogql_definition().fields.keys()) == ["not_in_definition"]
+
+        table.name = "stripe_account"
+        assert table.table_name_without_prefix == "stripe_account"
+        assert table.hogql_definition().fields == {**external_tables["stripe_account"], **external_tables["*"]}
+
+    def test_abulk_create_datawarehousetables(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+
+        tables = async_to_sync(abulk_create_datawarehousetables)(
+            [
+                {"name": name, "url_pattern": "", "format": "Parquet", "team": self.team, "credential": credential}
+                for name in ["table_one", "table_two"]
+            ]
+        )
+
+        assert all(table.id is not None and table.created_at is not None for table in tables)
+        assert sorted(DataWarehouseTable.objects.filter(team=self.team).values_list("name", flat=True)) == [
+            "table_one",
+            "table_two",
+        ]
+
+    def test_abulk_save_datawarehousetables(self):
+        credential = DataWarehouseCredential.objects.create(access_key="test", access_secret="test", team=self.team)
+        with freeze_time("2024-01-01T00:00:00Z"):
+            for name in ["table_one", "table_two"]:
+                DataWarehouseTable.objects.create(
+                    name=name, url_pattern="", format="Parquet", team=self.team, credential=credential
+                )
+
+        tables = list(DataWarehouseTable.objects.filter(team=self.team))
+        for table in tables:
+            table.row_count = 10
+            table.url_pattern = "https://example.com/changed"
+
+        with freeze_time("2024-02-01T00:00:00Z"):
+            async_to_sync(abulk_save_datawarehousetables)(tables, ["row_count"])
+
+        for table in DataWarehouseTable.objects.filter(team=self.team):
+            assert table.row_count == 10
+            assert table.url_pattern == ""
+            assert table.updated_at is not None and table.updated_at.isoformat() == "2024-02-01T00:00:00+00:00"
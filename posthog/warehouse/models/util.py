@@ -1,4 +1,5 @@
 import re
+from types import MappingProxyType
 
 from posthog.hogql.database.models import (
     BooleanDatabaseField,
@@ -60,40 +61,45 @@ def clean_type(column_type: str) -> str:
     return column_type
 
 
-CLICKHOUSE_HOGQL_MAPPING = {
-    "UUID": StringDatabaseField,
-    "String": StringDatabaseField,
-    "DateTime64": DateTimeDatabaseField,
-    "DateTime32": DateTimeDatabaseField,
-    "DateTime": DateTimeDatabaseField,
-    "Date": DateDatabaseField,
-    "Date32": DateDatabaseField,
-    "UInt8": IntegerDatabaseField,
-    "UInt16": IntegerDatabaseField,
-    "UInt32": IntegerDatabaseField,
-    "UInt64": IntegerDatabaseField,
-    "Float8": FloatDatabaseField,
-    "Float16": FloatDatabaseField,
-    "Float32": FloatDatabaseField,
-    "Float64": FloatDatabaseField,
-    "Int8": IntegerDatabaseField,
-    "Int16": IntegerDatabaseField,
-    "Int32": IntegerDatabaseField,
-    "Int64": IntegerDatabaseField,
-    "Tuple": StringJSONDatabaseField,
-    "Array": StringArrayDatabaseField,
-    "Map": StringJSONDatabaseField,
-    "Bool": BooleanDatabaseField,
-    "Decimal": FloatDatabaseField,
-}
-
-STR_TO_HOGQL_MAPPING = {
-    "BooleanDatabaseField": BooleanDatabaseField,
-    "DateDatabaseField": DateDatabaseField,
-    "DateTimeDatabaseField": DateTimeDatabaseField,
-    "IntegerDatabaseField": IntegerDatabaseField,
-    "FloatDatabaseField": FloatDatabaseField,
-    "StringArrayDatabaseField": StringArrayDatabaseField,
-    "StringDatabaseField": StringDatabaseField,
-    "StringJSONDatabaseField": StringJSONDatabaseField,
-}
+# Read-only, these are shared by every warehouse table definition
+CLICKHOUSE_HOGQL_MAPPING = MappingProxyType(
+    {
+        "UUID": StringDatabaseField,
+        "String": StringDatabaseField,
+        "DateTime64": DateTimeDatabaseField,
+        "DateTime32": DateTimeDatabaseField,
+        "DateTime": DateTimeDatabaseField,
+        "Date": DateDatabaseField,
+        "Date32": DateDatabaseField,
+        "UInt8": IntegerDatabaseField,
+        "UInt16": IntegerDatabaseField,
+        "UInt32": IntegerDatabaseField,
+        "UInt64": IntegerDatabaseField,
+        "Float8": FloatDatabaseField,
+        "Float16": FloatDatabaseField,
+        "Float32": FloatDatabaseField,
+        "Float64": FloatDatabaseField,
+        "Int8": IntegerDatabaseField,
+        "Int16": IntegerDatabaseField,
+        "Int32": IntegerDatabaseField,
+        "Int64": IntegerDatabaseField,
+        "Tuple": StringJSONDatabaseField,
+        "Array": StringArrayDatabaseField,
+        "Map": StringJSONDatabaseField,
+        "Bool": BooleanDatabaseField,
+        "Decimal": FloatDatabaseField,
+    }
+)
+
+STR_TO_HOGQL_MAPPING = MappingProxyType(
+    {
+        "BooleanDatabaseField": BooleanDatabaseField,
+        "DateDatabaseField": DateDatabaseField,
+        "DateTimeDatabaseField": DateTimeDatabaseField,
+        "IntegerDatabaseField": IntegerDatabaseField,
+        "FloatDatabaseField": FloatDatabaseField,
+        "StringArrayDatabaseField": StringArrayDatabaseField,
+        "StringDatabaseField": StringDatabaseField,
+        "StringJSONDatabaseField": StringJSONDatabaseField,
+    }
+)